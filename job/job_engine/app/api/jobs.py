@@ -1,11 +1,13 @@
 # app/api/jobs.py
+import json
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, and_, update
+from sqlalchemy import select, func, and_, insert, update, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.database import get_db
 from app.models.job import Job, JobStatus, JobType
 from app.models.user import User, UserRole
@@ -15,8 +17,20 @@ from app.schemas.job import (
 from app.auth.dependencies import get_current_user, RoleRequired
 from app.redis_client import get_redis, RedisQueue
 
+settings = get_settings()
+
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+STATS_CACHE_KEY = "jobs:stats"
+
+# Above this many jobs, bulk creation goes through COPY instead of INSERT.
+BULK_COPY_THRESHOLD = 50
+
+_COPY_COLUMNS = (
+    "id", "name", "job_type", "status", "priority", "payload",
+    "attempt", "max_retries", "created_at", "scheduled_at", "created_by",
+)
+
 
 @router.post("", response_model=JobResponse, status_code=201)
 async def create_job(
@@ -35,8 +49,9 @@ async def create_job(
         status=JobStatus.QUEUED,
     )
     db.add(job)
+    # No refresh needed: id/created_at/status defaults are all Python-side,
+    # so the instance is fully populated after the flush.
     await db.flush()
-    await db.refresh(job)
 
     # Enqueue in Redis
     r = await get_redis()
@@ -44,41 +59,105 @@ async def create_job(
         queue = RedisQueue(r)
         await queue.enqueue(str(job.id), job.priority)
         await queue.increment_stat("enqueued")
+        await r.delete(STATS_CACHE_KEY)
 
     return job
 
 
+async def _copy_bulk_jobs(
+    db: AsyncSession, data: BulkJobCreate, user: User
+) -> tuple[list[dict], list[tuple[str, int]]]:
+    """Bulk-load jobs through asyncpg's COPY protocol.
+
+    COPY streams all rows in one protocol exchange and is several times
+    faster than multi-row INSERT for large batches. All generated values
+    (id, created_at, status) are produced client-side, so the response
+    can be built without re-selecting the rows.
+    """
+    now = datetime.now(timezone.utc)
+    records = []
+    jobs = []
+    enqueue_items = []
+    for item in data.jobs:
+        job_id = uuid.uuid4()
+        records.append((
+            job_id,
+            item.name,
+            item.job_type.name,  # enum columns store member names
+            JobStatus.QUEUED.name,
+            item.priority,
+            json.dumps(item.payload),
+            0,
+            item.max_retries,
+            now,
+            item.scheduled_at,
+            user.username,
+        ))
+        jobs.append({
+            "id": job_id,
+            "name": item.name,
+            "job_type": item.job_type,
+            "status": JobStatus.QUEUED,
+            "priority": item.priority,
+            "payload": item.payload,
+            "result": None,
+            "error_message": None,
+            "attempt": 0,
+            "max_retries": item.max_retries,
+            "next_retry_at": None,
+            "created_at": now,
+            "scheduled_at": item.scheduled_at,
+            "started_at": None,
+            "completed_at": None,
+            "duration_seconds": None,
+            "created_by": user.username,
+            "worker_id": None,
+        })
+        enqueue_items.append((str(job_id), item.priority))
+
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "jobs", records=records, columns=_COPY_COLUMNS
+    )
+    return jobs, enqueue_items
+
+
 @router.post("/bulk", response_model=list[JobResponse], status_code=201)
 async def create_bulk_jobs(
     data: BulkJobCreate,
     user: User = Depends(RoleRequired(UserRole.OPERATOR)),
     db: AsyncSession = Depends(get_db),
 ):
-    jobs = []
-    for item in data.jobs:
-        job = Job(
-            name=item.name,
-            job_type=item.job_type,
-            priority=item.priority,
-            payload=item.payload,
-            max_retries=item.max_retries,
-            scheduled_at=item.scheduled_at,
-            created_by=user.username,
-            status=JobStatus.QUEUED,
+    if len(data.jobs) > BULK_COPY_THRESHOLD:
+        jobs, enqueue_items = await _copy_bulk_jobs(db, data, user)
+    else:
+        # One multi-row INSERT ... RETURNING instead of N inserts followed
+        # by N refresh round-trips for the generated columns.
+        rows = [
+            {
+                "name": item.name,
+                "job_type": item.job_type,
+                "priority": item.priority,
+                "payload": item.payload,
+                "max_retries": item.max_retries,
+                "scheduled_at": item.scheduled_at,
+                "created_by": user.username,
+                "status": JobStatus.QUEUED,
+            }
+            for item in data.jobs
+        ]
+        result = await db.execute(
+            insert(Job).returning(Job, sort_by_parameter_order=True), rows
         )
-        db.add(job)
-        jobs.append(job)
-
-    await db.flush()
-    for j in jobs:
-        await db.refresh(j)
+        jobs = result.scalars().all()
+        enqueue_items = [(str(j.id), j.priority) for j in jobs]
 
     r = await get_redis()
     if r:
         queue = RedisQueue(r)
-        for j in jobs:
-            await queue.enqueue(str(j.id), j.priority)
-        await queue.increment_stat("enqueued", len(jobs))
+        await queue.enqueue_many(enqueue_items)
+        await r.delete(STATS_CACHE_KEY)
 
     return jobs
 
@@ -87,8 +166,10 @@ async def create_bulk_jobs(
 async def list_jobs(
     status: JobStatus | None = None,
     job_type: JobType | None = None,
-    page: int = Query(1, ge=1),
+    cursor: datetime | None = None,
+    cursor_id: uuid.UUID | None = None,
     page_size: int = Query(50, ge=1, le=200),
+    include_total: bool = False,
     _user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -102,20 +183,38 @@ async def list_jobs(
         query = query.where(Job.job_type == job_type)
         count_query = count_query.where(Job.job_type == job_type)
 
-    total = (await db.execute(count_query)).scalar() or 0
+    # The exact count is often the most expensive part of this endpoint
+    # on a large table and is rarely needed past the first page, so it's
+    # opt-in (the UI requests it once, then pages by cursor).
+    total = None
+    if include_total:
+        total = (await db.execute(count_query)).scalar() or 0
+
+    # Keyset pagination: seek past the cursor instead of OFFSET-scanning
+    # and discarding rows, so deep pages cost the same as the first one.
+    # The cursor is composite (created_at, id) to match the ordering —
+    # created_at alone would skip rows sharing the boundary timestamp
+    # (bulk COPY stamps a whole batch with one created_at).
+    if cursor and cursor_id:
+        query = query.where(tuple_(Job.created_at, Job.id) < (cursor, cursor_id))
+    elif cursor:
+        query = query.where(Job.created_at < cursor)
 
     query = (
-        query.order_by(Job.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
+        query.order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(page_size + 1)  # fetch one extra row to detect "has more"
     )
-    result = await db.execute(query)
+    rows = (await db.execute(query)).scalars().all()
+
+    jobs = rows[:page_size]
+    has_more = len(rows) > page_size
 
     return JobListResponse(
-        jobs=result.scalars().all(),
+        jobs=jobs,
         total=total,
-        page=page,
         page_size=page_size,
+        next_cursor=jobs[-1].created_at if has_more else None,
+        next_cursor_id=jobs[-1].id if has_more else None,
     )
 
 
@@ -124,23 +223,39 @@ async def get_job_stats(
     _user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    # Short-TTL cache: many operators polling stats share one computation.
+    r = await get_redis()
+    if r:
+        cached = await r.get(STATS_CACHE_KEY)
+        if cached:
+            return JobStats(**json.loads(cached))
+
     now = datetime.now(timezone.utc)
 
-    # Status counts
-    status_result = await db.execute(
-        select(Job.status, func.count(Job.id)).group_by(Job.status)
+    # Everything as FILTER (WHERE ...) aggregates in a single SELECT:
+    # per-status counts, average duration, and recent-activity windows
+    # all come back in one row instead of four round-trips.
+    stmt = select(
+        func.count(Job.id).label("total"),
+        *[
+            func.count(Job.id).filter(Job.status == s).label(s.value)
+            for s in JobStatus
+        ],
+        func.avg(Job.duration_seconds)
+        .filter(Job.status == JobStatus.COMPLETED)
+        .label("avg_duration"),
+        func.count(Job.id)
+        .filter(Job.created_at >= now - timedelta(hours=1))
+        .label("jobs_1h"),
+        func.count(Job.id)
+        .filter(Job.created_at >= now - timedelta(hours=24))
+        .label("jobs_24h"),
     )
-    status_counts = {row[0]: row[1] for row in status_result.all()}
+    row = (await db.execute(stmt)).one()
 
-    total = sum(status_counts.values())
-
-    # Average duration of completed jobs
-    avg_dur = await db.execute(
-        select(func.avg(Job.duration_seconds)).where(
-            Job.status == JobStatus.COMPLETED
-        )
-    )
-    avg_duration = avg_dur.scalar()
+    total = row.total
+    status_counts = {s: getattr(row, s.value) for s in JobStatus}
+    avg_duration = row.avg_duration
 
     # Success rate
     completed = status_counts.get(JobStatus.COMPLETED, 0)
@@ -148,26 +263,10 @@ async def get_job_stats(
     finished = completed + failed
     success_rate = (completed / finished * 100) if finished > 0 else None
 
-    # Recent activity
-    from datetime import timedelta
+    jobs_1h = row.jobs_1h
+    jobs_24h = row.jobs_24h
 
-    jobs_1h = (
-        await db.execute(
-            select(func.count(Job.id)).where(
-                Job.created_at >= now - timedelta(hours=1)
-            )
-        )
-    ).scalar() or 0
-
-    jobs_24h = (
-        await db.execute(
-            select(func.count(Job.id)).where(
-                Job.created_at >= now - timedelta(hours=24)
-            )
-        )
-    ).scalar() or 0
-
-    return JobStats(
+    stats = JobStats(
         total_jobs=total,
         pending=status_counts.get(JobStatus.PENDING, 0),
         queued=status_counts.get(JobStatus.QUEUED, 0),
@@ -182,6 +281,15 @@ async def get_job_stats(
         jobs_last_24h=jobs_24h,
     )
 
+    if r:
+        await r.set(
+            STATS_CACHE_KEY,
+            stats.model_dump_json(),
+            ex=settings.STATS_CACHE_TTL_SECONDS,
+        )
+
+    return stats
+
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
@@ -202,27 +310,37 @@ async def cancel_job(
     user: User = Depends(RoleRequired(UserRole.OPERATOR)),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Job).where(Job.id == job_id).with_for_update()
+    # Lock, mutate, and fetch in a single UPDATE ... RETURNING; the state
+    # guard lives in the WHERE clause so the whole transition is atomic.
+    stmt = (
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.status.notin_([JobStatus.COMPLETED, JobStatus.CANCELLED]),
+        )
+        .values(
+            status=JobStatus.CANCELLED,
+            completed_at=datetime.now(timezone.utc),
+        )
+        .returning(Job)
     )
-    job = result.scalar_one_or_none()
+    job = (await db.execute(stmt)).scalar_one_or_none()
     if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    if job.status in (JobStatus.COMPLETED, JobStatus.CANCELLED):
+        # Error path only: distinguish a missing job from a bad state.
+        current = (
+            await db.execute(select(Job.status).where(Job.id == job_id))
+        ).scalar_one_or_none()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Job not found")
         raise HTTPException(
-            status_code=400, detail=f"Cannot cancel job in '{job.status.value}' state"
+            status_code=400, detail=f"Cannot cancel job in '{current.value}' state"
         )
 
-    job.status = JobStatus.CANCELLED
-    job.completed_at = datetime.now(timezone.utc)
-    await db.flush()
-    await db.refresh(job)
-
     r = await get_redis()
     if r:
         queue = RedisQueue(r)
         await queue.remove(str(job.id))
+        await r.delete(STATS_CACHE_KEY)
 
     return job
 
@@ -233,32 +351,39 @@ async def retry_job(
     user: User = Depends(RoleRequired(UserRole.OPERATOR)),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Job).where(Job.id == job_id).with_for_update()
+    stmt = (
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.status.in_([JobStatus.FAILED, JobStatus.CANCELLED]),
+        )
+        .values(
+            status=JobStatus.QUEUED,
+            attempt=0,
+            error_message=None,
+            result=None,
+            started_at=None,
+            completed_at=None,
+            duration_seconds=None,
+            next_retry_at=None,
+        )
+        .returning(Job)
     )
-    job = result.scalar_one_or_none()
+    job = (await db.execute(stmt)).scalar_one_or_none()
     if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    if job.status not in (JobStatus.FAILED, JobStatus.CANCELLED):
+        exists = (
+            await db.execute(select(Job.id).where(Job.id == job_id))
+        ).scalar_one_or_none()
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Job not found")
         raise HTTPException(
             status_code=400, detail="Can only retry failed or cancelled jobs"
         )
 
-    job.status = JobStatus.QUEUED
-    job.attempt = 0
-    job.error_message = None
-    job.result = None
-    job.started_at = None
-    job.completed_at = None
-    job.duration_seconds = None
-    job.next_retry_at = None
-    await db.flush()
-    await db.refresh(job)
-
     r = await get_redis()
     if r:
         queue = RedisQueue(r)
         await queue.enqueue(str(job.id), job.priority)
+        await r.delete(STATS_CACHE_KEY)
 
     return job
@@ -1,8 +1,13 @@
 # app/auth/__init__.py
-from app.auth.utils import hash_password, verify_password, create_access_token, decode_token
+from app.auth.utils import (
+    hash_password, verify_password, hash_password_async, verify_password_async,
+    create_access_token, decode_token,
+)
 from app.auth.dependencies import get_current_user, RoleRequired
 
 __all__ = [
-    "hash_password", "verify_password", "create_access_token", "decode_token",
+    "hash_password", "verify_password",
+    "hash_password_async", "verify_password_async",
+    "create_access_token", "decode_token",
     "get_current_user", "RoleRequired",
 ]
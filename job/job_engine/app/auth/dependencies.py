@@ -1,4 +1,5 @@
 # app/auth/dependencies.py
+import time
 import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,6 +11,31 @@ from app.auth.utils import decode_token
 
 security = HTTPBearer()
 
+# Short-TTL in-process cache of authenticated users. Skips the SELECT on
+# users for every request carrying a recently-seen subject; role/active
+# changes take effect within the TTL. The process is the auth boundary,
+# so an in-memory cache is safe here.
+_USER_CACHE_TTL = 30.0
+_USER_CACHE_MAX = 10_000
+_user_cache: dict[uuid.UUID, tuple[float, User]] = {}
+
+
+async def _get_user_cached(user_id: uuid.UUID, db: AsyncSession) -> User | None:
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        expires_at, user = cached
+        if expires_at > time.monotonic():
+            return user
+        del _user_cache[user_id]
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        if len(_user_cache) >= _USER_CACHE_MAX:
+            _user_cache.clear()
+        _user_cache[user_id] = (time.monotonic() + _USER_CACHE_TTL, user)
+    return user
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -25,8 +51,7 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+    user = await _get_user_cached(uuid.UUID(user_id), db)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     return user
@@ -43,11 +68,12 @@ class RoleRequired:
 
     def __init__(self, minimum_role: UserRole):
         self.minimum_role = minimum_role
+        # Resolved once at router definition time; __call__ runs on every
+        # authenticated mutation and only pays a single lookup.
+        self._required_level = self._role_hierarchy[minimum_role]
 
     def __call__(self, user: User = Depends(get_current_user)) -> User:
-        user_level = self._role_hierarchy.get(user.role, 0)
-        required_level = self._role_hierarchy.get(self.minimum_role, 0)
-        if user_level < required_level:
+        if self._role_hierarchy.get(user.role, 0) < self._required_level:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Role '{self.minimum_role.value}' or higher required",
@@ -5,7 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserResponse, Token
-from app.auth.utils import hash_password, verify_password, create_access_token
+from app.auth.utils import (
+    hash_password_async, verify_password_async, create_access_token,
+)
 from app.auth.dependencies import RoleRequired
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -25,12 +27,11 @@ async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
     user = User(
         username=data.username,
         email=data.email,
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password_async(data.password),
         role=data.role,
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
     return user
 
 
@@ -38,7 +39,7 @@ async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(username: str, password: str, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.username == username))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account disabled")
@@ -1,12 +1,19 @@
 # app/auth/utils.py
+import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
 from app.config import get_settings
 from app.models.user import UserRole
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
 
 
 def hash_password(password: str) -> str:
@@ -17,6 +24,16 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash on a worker thread; bcrypt is ~100ms of CPU that would
+    otherwise stall every coroutine on the event loop."""
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await asyncio.to_thread(verify_password, plain, hashed)
+
+
 def create_access_token(
     subject: str, role: UserRole, expires_delta: timedelta | None = None
 ) -> str:
@@ -27,8 +44,35 @@ def create_access_token(
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+# Tokens are immutable until expiry, so cache verified payloads and skip
+# the HMAC verification + JSON parse on repeated requests with the same
+# token (the common case for an active session).
+_JWT_CACHE_MAX = 4096
+_jwt_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
 def decode_token(token: str) -> dict | None:
+    cached = _jwt_cache.get(token)
+    if cached is not None:
+        exp, payload = cached
+        if exp > time.time():
+            _jwt_cache.move_to_end(token)
+            return payload
+        del _jwt_cache[token]
+
     try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-    except JWTError:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.PyJWTError:
         return None
+
+    exp = payload.get("exp")
+    if exp:
+        _jwt_cache[token] = (float(exp), payload)
+        if len(_jwt_cache) > _JWT_CACHE_MAX:
+            _jwt_cache.popitem(last=False)
+    return payload
@@ -1,4 +1,5 @@
 # app/database.py
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -9,11 +10,21 @@ from app.config import get_settings
 
 settings = get_settings()
 
+
+def _json_serializer(value) -> str:
+    # orjson for the payload/result JSONB columns; the engine expects str.
+    return orjson.dumps(value).decode()
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
     echo=settings.DEBUG,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 async_session_factory = async_sessionmaker(
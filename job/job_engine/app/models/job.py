@@ -3,11 +3,11 @@ import uuid
 import enum
 from datetime import datetime, timezone
 from sqlalchemy import (
-    String, Integer, DateTime, Text, JSON,
-    Enum as SAEnum, Index, Float
+    String, Integer, DateTime, Text,
+    Enum as SAEnum, Index, Float, text
 )
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from app.database import Base
 
 
@@ -39,6 +39,22 @@ class Job(Base):
     __table_args__ = (
         Index("ix_jobs_status_priority", "status", "priority"),
         Index("ix_jobs_scheduled_at", "scheduled_at"),
+        # Partial index for the dashboard/stats aggregations, which all
+        # filter on status = COMPLETED plus a completed_at window.
+        Index(
+            "ix_jobs_completed_at",
+            "completed_at",
+            postgresql_where=text("status = 'COMPLETED'"),
+        ),
+        # Serves the jobs_last_hour/24h counts and ORDER BY created_at DESC.
+        Index("ix_jobs_created_at", "created_at"),
+        # Containment lookups into job payloads (jsonb @> queries).
+        Index(
+            "ix_jobs_payload_gin",
+            "payload",
+            postgresql_using="gin",
+            postgresql_ops={"payload": "jsonb_path_ops"},
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -52,8 +68,8 @@ class Job(Base):
     priority: Mapped[int] = mapped_column(
         Integer, default=JobPriority.NORMAL, nullable=False
     )
-    payload: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
-    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Retry tracking
@@ -1,5 +1,5 @@
 # app/redis_client.py
-import json
+import orjson
 import redis.asyncio as redis
 from app.config import get_settings
 from contextlib import asynccontextmanager
@@ -30,6 +30,29 @@ async def close_redis():
         _redis_pool = None
 
 
+# Pop the highest-priority job and register it as processing in one
+# atomic server-side step (one round-trip, no window between the two).
+_DEQUEUE_LUA = """
+local popped = redis.call('ZPOPMIN', KEYS[1], 1)
+if #popped == 0 then return nil end
+redis.call('SADD', KEYS[2], popped[1])
+return popped[1]
+"""
+
+# Batch analogue of _DEQUEUE_LUA: pop up to ARGV[1] members and register
+# them all as processing in the same atomic server-side step.
+_DEQUEUE_MANY_LUA = """
+local popped = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+if #popped == 0 then return {} end
+local ids = {}
+for i = 1, #popped, 2 do
+    ids[#ids + 1] = popped[i]
+end
+redis.call('SADD', KEYS[2], unpack(ids))
+return ids
+"""
+
+
 class RedisQueue:
     """Priority queue backed by Redis sorted sets."""
 
@@ -39,20 +62,54 @@ class RedisQueue:
 
     def __init__(self, client: redis.Redis):
         self.client = client
+        self._dequeue_script = client.register_script(_DEQUEUE_LUA)
+        self._dequeue_many_script = client.register_script(_DEQUEUE_MANY_LUA)
 
     async def enqueue(self, job_id: str, priority: int = 5):
         # Higher priority = lower score = dequeued first
         score = -priority
         await self.client.zadd(self.QUEUE_KEY, {job_id: score})
 
+    async def enqueue_many(self, items: list[tuple[str, int]]):
+        """Enqueue a batch of (job_id, priority) pairs in one round-trip."""
+        if not items:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zadd(self.QUEUE_KEY, {job_id: -priority for job_id, priority in items})
+            pipe.hincrby(self.STATS_KEY, "enqueued", len(items))
+            await pipe.execute()
+
     async def dequeue(self) -> str | None:
-        # Atomically pop the highest-priority job
-        result = await self.client.zpopmin(self.QUEUE_KEY, count=1)
-        if result:
-            job_id, _score = result[0]
-            await self.client.sadd(self.PROCESSING_KEY, job_id)
-            return job_id
-        return None
+        # Atomically pop the highest-priority job and mark it processing
+        return await self._dequeue_script(
+            keys=[self.QUEUE_KEY, self.PROCESSING_KEY]
+        )
+
+    async def dequeue_many(self, count: int) -> list[str]:
+        """Pop up to count jobs at once and mark them all processing.
+
+        One atomic Lua call: the round-trip is amortized over the whole
+        batch and there is no window between the pop and the
+        processing-set registration for ids to be lost in.
+        """
+        job_ids = await self._dequeue_many_script(
+            keys=[self.QUEUE_KEY, self.PROCESSING_KEY], args=[count]
+        )
+        return job_ids or []
+
+    async def release_many(self, items: list[tuple[str, int]]):
+        """Put popped-but-unprocessed jobs back on the queue.
+
+        Shutdown counterpart to dequeue_many: re-adds the ids and clears
+        their processing-set entries in one pipeline, without touching
+        the enqueued stat (these jobs were already counted once).
+        """
+        if not items:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zadd(self.QUEUE_KEY, {job_id: -priority for job_id, priority in items})
+            pipe.srem(self.PROCESSING_KEY, *[job_id for job_id, _priority in items])
+            await pipe.execute()
 
     async def mark_done(self, job_id: str):
         await self.client.srem(self.PROCESSING_KEY, job_id)
@@ -64,8 +121,10 @@ class RedisQueue:
         return await self.client.scard(self.PROCESSING_KEY)
 
     async def remove(self, job_id: str):
-        await self.client.zrem(self.QUEUE_KEY, job_id)
-        await self.client.srem(self.PROCESSING_KEY, job_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrem(self.QUEUE_KEY, job_id)
+            pipe.srem(self.PROCESSING_KEY, job_id)
+            await pipe.execute()
 
     async def increment_stat(self, stat_name: str, amount: int = 1):
         await self.client.hincrby(self.STATS_KEY, stat_name, amount)
@@ -73,6 +132,42 @@ class RedisQueue:
     async def get_stats(self) -> dict:
         return await self.client.hgetall(self.STATS_KEY) or {}
 
+    async def dashboard_snapshot(self) -> dict:
+        """Fetch queue length, processing count, and stats in one round-trip."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zcard(self.QUEUE_KEY)
+            pipe.scard(self.PROCESSING_KEY)
+            pipe.hgetall(self.STATS_KEY)
+            queue_length, processing, stats = await pipe.execute()
+        return {
+            "queue_length": queue_length,
+            "processing": processing,
+            "stats": stats or {},
+        }
+
     async def publish_event(self, event_type: str, data: dict):
-        message = json.dumps({"event": event_type, **data})
+        message = orjson.dumps({"event": event_type, **data}).decode()
         await self.client.publish("job_events", message)
+
+    async def finalize(
+        self,
+        job_id: str,
+        stat_name: str,
+        event_type: str | None = None,
+        event_data: dict | None = None,
+    ):
+        """Post-execution bookkeeping in one round-trip.
+
+        Pipelines mark_done, the stat increment, and (optionally) the
+        event publish instead of paying three sequential round-trips
+        after every job.
+        """
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.srem(self.PROCESSING_KEY, job_id)
+            pipe.hincrby(self.STATS_KEY, stat_name, 1)
+            if event_type:
+                message = orjson.dumps(
+                    {"event": event_type, **(event_data or {})}
+                ).decode()
+                pipe.publish("job_events", message)
+            await pipe.execute()
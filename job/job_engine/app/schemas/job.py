@@ -39,9 +39,10 @@ class JobResponse(BaseModel):
 
 class JobListResponse(BaseModel):
     jobs: list[JobResponse]
-    total: int
-    page: int
+    total: int | None = None
     page_size: int
+    next_cursor: datetime | None = None
+    next_cursor_id: uuid.UUID | None = None
 
 
 class JobStats(BaseModel):
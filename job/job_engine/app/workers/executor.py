@@ -1,75 +1,140 @@
 # app/workers/executor.py
 import asyncio
 import logging
+import random
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select, update
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.database import async_session_factory
-from app.models.job import Job, JobStatus
-from app.workers.handlers import HANDLER_MAP
-from app.redis_client import get_redis, RedisQueue
+from app.models.job import Job, JobStatus, JobType
+from app.workers.handlers import get_handler
+from app.redis_client import RedisQueue
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+class _TokenBucket:
+    """Minimal monotonic-clock token bucket (single event loop, no lock)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._last = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+# Per-type retry budgets. When a downstream (SMTP, model server, ...) is
+# hard-down, every in-flight job of that type fails at once; the bucket
+# caps how fast they can re-enter the queue instead of letting retry
+# volume amplify the outage.
+_retry_buckets: dict[JobType, _TokenBucket] = {
+    job_type: _TokenBucket(
+        settings.RETRY_TOKENS_PER_SECOND, settings.RETRY_BUCKET_CAPACITY
+    )
+    for job_type in JobType
+}
+
+
 class JobExecutor:
     """Executes a single job with timeout, error handling, and retry logic."""
 
-    def __init__(self, worker_id: str):
+    def __init__(self, worker_id: str, queue: RedisQueue | None = None):
         self.worker_id = worker_id
+        # Shared queue handle injected by the manager; saves a get_redis
+        # await plus a RedisQueue allocation on every finalization path.
+        self.queue = queue
+        # Per-worker generator so backoff draws don't contend on the
+        # shared module-level random state.
+        self._rng = random.Random(worker_id)
+        # Monotonic start mark set at claim time; durations come from the
+        # perf counter instead of subtracting two wall-clock datetimes.
+        self._t0: float | None = None
 
     async def execute(self, job_id: uuid.UUID) -> bool:
         async with async_session_factory() as db:
             job = await self._claim_job(db, job_id)
             if not job:
                 return False
+            return await self._run(db, job)
 
-            handler = HANDLER_MAP.get(job.job_type)
-            if not handler:
-                await self._fail_job(db, job, f"No handler for type: {job.job_type}")
-                return False
+    async def execute_claimed(self, job: Job) -> bool:
+        """Run a job the manager already claimed (PG batch dequeue)."""
+        self._t0 = time.perf_counter()
+        logger.info(
+            f"[{self.worker_id}] Executing pre-claimed job {job.id} "
+            f"(attempt {job.attempt}/{job.max_retries})"
+        )
+        async with async_session_factory() as db:
+            return await self._run(db, job)
 
-            try:
-                result = await asyncio.wait_for(
-                    handler(job.payload),
-                    timeout=settings.JOB_TIMEOUT_SECONDS,
-                )
-                await self._complete_job(db, job, result)
-                return True
+    async def _run(self, db: AsyncSession, job: Job) -> bool:
+        handler = get_handler(job.job_type)
+        if not handler:
+            await self._fail_job(db, job, f"No handler for type: {job.job_type}")
+            return False
 
-            except asyncio.TimeoutError:
-                await self._handle_failure(
-                    db, job, f"Job timed out after {settings.JOB_TIMEOUT_SECONDS}s"
-                )
-                return False
+        try:
+            result = await asyncio.wait_for(
+                handler(job.payload),
+                timeout=settings.JOB_TIMEOUT_SECONDS,
+            )
+            await self._complete_job(db, job, result)
+            return True
 
-            except Exception as e:
-                await self._handle_failure(db, job, str(e))
-                return False
+        except asyncio.TimeoutError:
+            await self._handle_failure(
+                db, job, f"Job timed out after {settings.JOB_TIMEOUT_SECONDS}s"
+            )
+            return False
+
+        except Exception as e:
+            await self._handle_failure(db, job, str(e))
+            return False
 
     async def _claim_job(self, db: AsyncSession, job_id: uuid.UUID) -> Job | None:
-        """Atomically claim job using SELECT ... FOR UPDATE SKIP LOCKED."""
-        result = await db.execute(
-            select(Job)
-            .where(Job.id == job_id)
-            .where(Job.status.in_([JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RETRYING]))
-            .with_for_update(skip_locked=True)
+        """Atomically claim the job with a single UPDATE ... RETURNING.
+
+        The status guard in the WHERE clause plays the role of the old
+        SELECT ... FOR UPDATE SKIP LOCKED: a job already claimed (or
+        cancelled) simply matches no row. One round-trip locks, mutates,
+        and returns the full row, so no follow-up refresh is needed.
+        """
+        stmt = (
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status.in_(
+                    [JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RETRYING]
+                ),
+            )
+            .values(
+                status=JobStatus.RUNNING,
+                started_at=datetime.now(timezone.utc),
+                attempt=Job.attempt + 1,
+                worker_id=self.worker_id,
+            )
+            .returning(Job)
         )
-        job = result.scalar_one_or_none()
+        job = (await db.execute(stmt)).scalar_one_or_none()
         if not job:
             return None
-
-        job.status = JobStatus.RUNNING
-        job.started_at = datetime.now(timezone.utc)
-        job.attempt += 1
-        job.worker_id = self.worker_id
         await db.commit()
-        await db.refresh(job)
+        self._t0 = time.perf_counter()
 
         logger.info(
             f"[{self.worker_id}] Claimed job {job.id} "
@@ -77,73 +142,133 @@ class JobExecutor:
         )
         return job
 
+    async def _commit_and_finalize(
+        self,
+        db: AsyncSession,
+        job_id: str,
+        stat_name: str,
+        event_type: str | None = None,
+        event_data: dict | None = None,
+    ):
+        """Run the DB commit and the Redis finalization pipeline together.
+
+        They hit different backends, so one await covers both round-trips.
+        return_exceptions keeps a Redis hiccup from masking the commit
+        result: the commit error (the one that matters) is re-raised,
+        while a failed finalize is only logged — stats and events are
+        best-effort.
+        """
+        if not self.queue:
+            await db.commit()
+            return
+        commit_res, redis_res = await asyncio.gather(
+            db.commit(),
+            self.queue.finalize(job_id, stat_name, event_type, event_data),
+            return_exceptions=True,
+        )
+        if isinstance(redis_res, BaseException):
+            logger.warning(f"Redis finalize failed for job {job_id}: {redis_res}")
+        if isinstance(commit_res, BaseException):
+            raise commit_res
+
     async def _complete_job(self, db: AsyncSession, job: Job, result: dict):
         now = datetime.now(timezone.utc)
-        duration = (now - job.started_at).total_seconds() if job.started_at else None
+        duration = (
+            time.perf_counter() - self._t0 if self._t0 is not None else None
+        )
 
-        job.status = JobStatus.COMPLETED
-        job.result = result
-        job.completed_at = now
-        job.duration_seconds = duration
-        job.error_message = None
-        await db.commit()
+        # Core UPDATE keyed on the id: skips the unit-of-work flush
+        # (dirty-attribute diffing, identity-map sync) on the per-job
+        # hot path.
+        await db.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(
+                status=JobStatus.COMPLETED,
+                result=result,
+                completed_at=now,
+                duration_seconds=duration,
+                error_message=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit_and_finalize(
+            db,
+            str(job.id),
+            "completed",
+            "job_completed",
+            {"job_id": str(job.id), "duration": duration},
+        )
 
         logger.info(
             f"[{self.worker_id}] Job {job.id} completed in {duration:.2f}s"
         )
 
-        # Update Redis stats
-        r = await get_redis()
-        if r:
-            queue = RedisQueue(r)
-            await queue.mark_done(str(job.id))
-            await queue.increment_stat("completed")
-            await queue.publish_event("job_completed", {
-                "job_id": str(job.id),
-                "duration": duration,
-            })
-
     async def _handle_failure(self, db: AsyncSession, job: Job, error: str):
         """Decide whether to retry or permanently fail."""
+        if job.attempt < job.max_retries and not _retry_buckets[
+            job.job_type
+        ].try_acquire():
+            # Retry budget for this type is exhausted — fail fast rather
+            # than feed a retry storm.
+            await self._fail_job(
+                db, job, f"{error} (retry budget exhausted for {job.job_type.value})"
+            )
+            return
+
         if job.attempt < job.max_retries:
-            # Exponential backoff: 2^attempt seconds
-            backoff = settings.RETRY_BACKOFF_BASE ** job.attempt
-            job.status = JobStatus.RETRYING
-            job.next_retry_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
-            job.error_message = f"Attempt {job.attempt} failed: {error}"
-            await db.commit()
+            # Full-jitter exponential backoff (AWS-style): draw uniformly
+            # from [0, min(cap, base^attempt)] so simultaneously-failing
+            # jobs don't retry in lockstep against the same downstream.
+            backoff = self._rng.uniform(
+                0,
+                min(
+                    settings.RETRY_BACKOFF_CAP,
+                    settings.RETRY_BACKOFF_BASE ** job.attempt,
+                ),
+            )
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id)
+                .values(
+                    status=JobStatus.RETRYING,
+                    next_retry_at=datetime.now(timezone.utc)
+                    + timedelta(seconds=backoff),
+                    error_message=f"Attempt {job.attempt} failed: {error}",
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self._commit_and_finalize(db, str(job.id), "retries")
 
             logger.warning(
                 f"[{self.worker_id}] Job {job.id} failed (attempt {job.attempt}), "
                 f"retrying in {backoff:.1f}s: {error}"
             )
-
-            # Re-enqueue in Redis
-            r = await get_redis()
-            if r:
-                queue = RedisQueue(r)
-                await queue.mark_done(str(job.id))
-                await queue.increment_stat("retries")
         else:
             await self._fail_job(db, job, error)
 
     async def _fail_job(self, db: AsyncSession, job: Job, error: str):
         now = datetime.now(timezone.utc)
-        job.status = JobStatus.FAILED
-        job.error_message = error
-        job.completed_at = now
-        if job.started_at:
-            job.duration_seconds = (now - job.started_at).total_seconds()
-        await db.commit()
+        duration = (
+            time.perf_counter() - self._t0 if self._t0 is not None else None
+        )
+        await db.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(
+                status=JobStatus.FAILED,
+                error_message=error,
+                completed_at=now,
+                duration_seconds=duration,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit_and_finalize(
+            db,
+            str(job.id),
+            "failed",
+            "job_failed",
+            {"job_id": str(job.id), "error": error},
+        )
 
         logger.error(f"[{self.worker_id}] Job {job.id} permanently failed: {error}")
-
-        r = await get_redis()
-        if r:
-            queue = RedisQueue(r)
-            await queue.mark_done(str(job.id))
-            await queue.increment_stat("failed")
-            await queue.publish_event("job_failed", {
-                "job_id": str(job.id),
-                "error": error,
-            })
@@ -1,11 +1,22 @@
 # app/workers/handlers/__init__.py
+from types import MappingProxyType
+
 from app.models.job import JobType
 from app.workers.handlers.email_handler import handle_email
 from app.workers.handlers.ai_handler import handle_ai_task
 from app.workers.handlers.data_cleaning_handler import handle_data_cleaning
 
-HANDLER_MAP = {
-    JobType.EMAIL: handle_email,
-    JobType.AI_TASK: handle_ai_task,
-    JobType.DATA_CLEANING: handle_data_cleaning,
-}
+# Frozen at import time: the dispatch table never changes after startup,
+# and the read-only proxy guarantees no handler is swapped out from under
+# a running worker.
+HANDLER_MAP = MappingProxyType(
+    {
+        JobType.EMAIL: handle_email,
+        JobType.AI_TASK: handle_ai_task,
+        JobType.DATA_CLEANING: handle_data_cleaning,
+    }
+)
+
+# Pre-bound lookup for the executor hot path (skips the attribute fetch
+# on every dispatch).
+get_handler = HANDLER_MAP.get
@@ -5,6 +5,10 @@ import random
 
 logger = logging.getLogger(__name__)
 
+# Module-private generator: avoids contending on the lock guarding the
+# shared random module state when many jobs run concurrently.
+_rng = random.Random()
+
 
 async def handle_ai_task(payload: dict) -> dict:
     """Simulate an AI processing task (summarization, classification, etc.)."""
@@ -23,8 +27,8 @@ async def handle_ai_task(payload: dict) -> dict:
     # Simulated results
     results = {
         "classification": {
-            "label": random.choice(["positive", "negative", "neutral"]),
-            "confidence": round(random.uniform(0.7, 0.99), 3),
+            "label": _rng.choice(["positive", "negative", "neutral"]),
+            "confidence": round(_rng.uniform(0.7, 0.99), 3),
         },
         "summarization": {
             "summary": input_text[:100] + "..." if len(input_text) > 100 else input_text,
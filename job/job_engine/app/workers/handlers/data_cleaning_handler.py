@@ -5,6 +5,9 @@ import random
 
 logger = logging.getLogger(__name__)
 
+# Module-private generator; see ai_handler for rationale.
+_rng = random.Random()
+
 
 async def handle_data_cleaning(payload: dict) -> dict:
     """Simulate data cleaning / ETL task."""
@@ -20,7 +23,7 @@ async def handle_data_cleaning(payload: dict) -> dict:
     if payload.get("simulate_failure"):
         raise RuntimeError("Data source connection lost (simulated)")
 
-    cleaned = int(row_count * random.uniform(0.85, 0.99))
+    cleaned = int(row_count * _rng.uniform(0.85, 0.99))
     removed = row_count - cleaned
 
     return {
@@ -29,5 +32,5 @@ async def handle_data_cleaning(payload: dict) -> dict:
         "cleaned_rows": cleaned,
         "removed_rows": removed,
         "operations_applied": operations,
-        "quality_score": round(random.uniform(0.90, 1.0), 3),
+        "quality_score": round(_rng.uniform(0.90, 1.0), 3),
     }
@@ -1,14 +1,16 @@
 # app/workers/manager.py
 import asyncio
 import logging
+import random
 import uuid
+from collections import deque
 from datetime import datetime, timezone
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update
 
 from app.config import get_settings
 from app.database import async_session_factory
-from app.models.job import Job, JobStatus
+from app.models.job import Job, JobPriority, JobStatus
 from app.redis_client import get_redis, RedisQueue
 from app.workers.executor import JobExecutor
 
@@ -25,13 +27,36 @@ class WorkerManager:
     def __init__(self):
         self.manager_id = f"mgr-{uuid.uuid4().hex[:8]}"
         self.semaphore = asyncio.Semaphore(settings.MAX_WORKERS)
+        # Bound once at startup; every job path reuses this handle instead
+        # of re-resolving the client and building a fresh RedisQueue.
+        self.queue: RedisQueue | None = None
         self._running = False
-        self._active_tasks: set[asyncio.Task] = set()
+        # Plain counter instead of a task set: no per-job hashing or
+        # done-callback, just +1/-1 around each job. The event signals
+        # "no jobs in flight" for graceful shutdown.
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # Jobs popped from Redis in batches (ids) or claimed from the PG
+        # fallback (full rows), drained one per poll cycle.
+        self._prefetch: deque[uuid.UUID | Job] = deque()
+        # Per-manager generator for sleep jitter, seeded on the manager id
+        # so multiple managers decorrelate instead of polling in lockstep.
+        self._rng = random.Random(self.manager_id)
         self._poll_task: asyncio.Task | None = None
         self._retry_task: asyncio.Task | None = None
 
     async def start(self):
         self._running = True
+        # Run new tasks inline until their first real suspension; job
+        # coroutines whose awaits complete synchronously (cached Redis
+        # handles, short handlers) skip a scheduler hop entirely.
+        # Only available on Python 3.12+; older runtimes keep the
+        # default factory.
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        r = await get_redis()
+        self.queue = RedisQueue(r) if r else None
         logger.info(
             f"[{self.manager_id}] Starting worker manager "
             f"(max_workers={settings.MAX_WORKERS})"
@@ -49,24 +74,69 @@ class WorkerManager:
             self._retry_task.cancel()
 
         # Wait for active tasks to complete
-        if self._active_tasks:
-            logger.info(f"Waiting for {len(self._active_tasks)} active tasks...")
-            await asyncio.gather(*self._active_tasks, return_exceptions=True)
+        if self._active:
+            logger.info(f"Waiting for {self._active} active tasks...")
+            await self._idle.wait()
+
+        # Return any prefetched-but-unstarted work to the queue; without
+        # this, Redis ids stay stranded in the processing set and
+        # PG-claimed rows are orphaned in RUNNING forever.
+        await self._requeue_prefetched()
 
         logger.info(f"[{self.manager_id}] Worker manager stopped.")
 
+    async def _requeue_prefetched(self):
+        """Release claimed-but-unstarted prefetch entries on shutdown."""
+        if not self._prefetch:
+            return
+        items = list(self._prefetch)
+        self._prefetch.clear()
+        claimed = [item for item in items if isinstance(item, Job)]
+        redis_ids = [item for item in items if not isinstance(item, Job)]
+        try:
+            if redis_ids and self.queue:
+                # dequeue_many only returns ids, so the original priority
+                # is gone; re-enqueue at the default.
+                await self.queue.release_many(
+                    [(str(jid), int(JobPriority.NORMAL)) for jid in redis_ids]
+                )
+            if claimed:
+                # Undo the batch claim: back to QUEUED with the attempt
+                # increment reverted, as if never picked up.
+                async with async_session_factory() as db:
+                    await db.execute(
+                        update(Job)
+                        .where(
+                            Job.id.in_([j.id for j in claimed]),
+                            Job.status == JobStatus.RUNNING,
+                        )
+                        .values(
+                            status=JobStatus.QUEUED,
+                            started_at=None,
+                            worker_id=None,
+                            attempt=Job.attempt - 1,
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+            logger.info(f"Re-queued {len(items)} prefetched jobs on shutdown")
+        except Exception as e:
+            logger.error(f"Failed to re-queue prefetched jobs on shutdown: {e}")
+
     async def _poll_loop(self):
         """Main loop: dequeue jobs from Redis or poll PostgreSQL."""
         while self._running:
             try:
-                job_id = await self._dequeue_job()
-                if job_id:
+                job = await self._dequeue_job()
+                if job is not None:
                     await self.semaphore.acquire()
-                    task = asyncio.create_task(self._run_job(job_id))
-                    self._active_tasks.add(task)
-                    task.add_done_callback(self._task_done)
+                    self._active += 1
+                    self._idle.clear()
+                    asyncio.create_task(self._run_job(job))
                 else:
-                    await asyncio.sleep(settings.POLL_INTERVAL_SECONDS)
+                    await asyncio.sleep(
+                        settings.POLL_INTERVAL_SECONDS * self._rng.uniform(0.5, 1.5)
+                    )
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -77,41 +147,41 @@ class WorkerManager:
         """Periodically check for jobs ready for retry."""
         while self._running:
             try:
-                await asyncio.sleep(5)
+                await asyncio.sleep(5 * self._rng.uniform(0.5, 1.5))
                 async with async_session_factory() as db:
                     now = datetime.now(timezone.utc)
+                    # Select the priority alongside the id up front so the
+                    # re-enqueue needs no follow-up lookups.
                     result = await db.execute(
-                        select(Job.id).where(
+                        select(Job.id, Job.priority).where(
                             and_(
                                 Job.status == JobStatus.RETRYING,
                                 Job.next_retry_at <= now,
                             )
                         ).limit(settings.MAX_WORKERS)
                     )
-                    retry_ids = [row[0] for row in result.all()]
-
-                    for jid in retry_ids:
-                        r = await get_redis()
-                        if r:
-                            queue = RedisQueue(r)
-                            # Re-enqueue with original priority via DB lookup
-                            job_result = await db.execute(
-                                select(Job.priority).where(Job.id == jid)
-                            )
-                            priority = job_result.scalar() or 5
-                            await queue.enqueue(str(jid), priority)
-                        else:
-                            # Without Redis, the poll loop will pick it up
-                            stmt = (
-                                select(Job)
-                                .where(Job.id == jid)
-                                .with_for_update(skip_locked=True)
+                    retry_rows = result.all()
+                    retry_ids = [jid for jid, _priority in retry_rows]
+
+                    if retry_rows and self.queue:
+                        await self.queue.enqueue_many(
+                            [
+                                (str(jid), priority or 5)
+                                for jid, priority in retry_rows
+                            ]
+                        )
+                    elif retry_ids:
+                        # Without Redis, the poll loop will pick these up;
+                        # flip the whole batch in one UPDATE instead of a
+                        # lock-and-mutate round-trip per job.
+                        await db.execute(
+                            update(Job)
+                            .where(
+                                Job.id.in_(retry_ids),
+                                Job.status == JobStatus.RETRYING,
                             )
-                            job_row = await db.execute(stmt)
-                            job_obj = job_row.scalar_one_or_none()
-                            if job_obj:
-                                job_obj.status = JobStatus.QUEUED
-                                job_obj.next_retry_at = None
+                            .values(status=JobStatus.QUEUED, next_retry_at=None)
+                        )
 
                     if retry_ids:
                         await db.commit()
@@ -122,46 +192,72 @@ class WorkerManager:
             except Exception as e:
                 logger.error(f"Retry loop error: {e}")
 
-    async def _dequeue_job(self) -> uuid.UUID | None:
+    async def _dequeue_job(self) -> uuid.UUID | Job | None:
         """Try Redis first, fall back to PostgreSQL."""
-        r = await get_redis()
-        if r:
-            queue = RedisQueue(r)
-            job_id_str = await queue.dequeue()
-            if job_id_str:
-                return uuid.UUID(job_id_str)
+        if self._prefetch:
+            return self._prefetch.popleft()
 
-        # Fallback: query PostgreSQL directly
+        if self.queue:
+            # Pop a batch sized to the free worker slots so one Redis
+            # round-trip feeds several jobs.
+            free_slots = max(settings.MAX_WORKERS - self._active, 1)
+            job_ids = await self.queue.dequeue_many(min(free_slots, 32))
+            if job_ids:
+                self._prefetch.extend(uuid.UUID(j) for j in job_ids)
+                return self._prefetch.popleft()
+
+        # Fallback: claim a batch straight out of PostgreSQL. The UPDATE
+        # wraps a SKIP LOCKED subquery, so one statement atomically picks,
+        # claims, and returns full rows sized to the free worker slots —
+        # the executor then skips its own claim round-trip.
         async with async_session_factory() as db:
             now = datetime.now(timezone.utc)
-            result = await db.execute(
+            batch = min(max(settings.MAX_WORKERS - self._active, 1), 16)
+            claim_ids = (
                 select(Job.id)
                 .where(
                     Job.status.in_([JobStatus.PENDING, JobStatus.QUEUED]),
                     (Job.scheduled_at.is_(None)) | (Job.scheduled_at <= now),
                 )
                 .order_by(Job.priority.desc(), Job.created_at.asc())
-                .limit(1)
+                .limit(batch)
                 .with_for_update(skip_locked=True)
+                .scalar_subquery()
             )
-            row = result.first()
-            if row:
-                return row[0]
+            result = await db.execute(
+                update(Job)
+                .where(Job.id.in_(claim_ids))
+                .values(
+                    status=JobStatus.RUNNING,
+                    started_at=now,
+                    attempt=Job.attempt + 1,
+                    worker_id=self.manager_id,
+                )
+                .returning(Job)
+                .execution_options(synchronize_session=False)
+            )
+            jobs = result.scalars().all()
+            if jobs:
+                await db.commit()
+                self._prefetch.extend(jobs)
+                return self._prefetch.popleft()
         return None
 
-    async def _run_job(self, job_id: uuid.UUID):
+    async def _run_job(self, job: uuid.UUID | Job):
         worker_id = f"{self.manager_id}:w-{uuid.uuid4().hex[:6]}"
-        executor = JobExecutor(worker_id)
+        executor = JobExecutor(worker_id, queue=self.queue)
         try:
-            await executor.execute(job_id)
+            if isinstance(job, Job):
+                await executor.execute_claimed(job)
+            else:
+                await executor.execute(job)
         except Exception as e:
-            logger.error(f"Unhandled executor error for job {job_id}: {e}")
-
-    def _task_done(self, task: asyncio.Task):
-        self._active_tasks.discard(task)
-        self.semaphore.release()
-        if task.exception():
-            logger.error(f"Task exception: {task.exception()}")
+            logger.error(f"Unhandled executor error for job {job}: {e}")
+        finally:
+            self._active -= 1
+            self.semaphore.release()
+            if self._active == 0:
+                self._idle.set()
 
 
 # Global instance
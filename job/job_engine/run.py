@@ -8,4 +8,6 @@ if __name__ == "__main__":
         port=8000,
         reload=True,
         log_level="info",
+        loop="uvloop",
+        http="httptools",
     )